@@ -4,7 +4,8 @@ import sys
 import os
 import json
 import pickle
-from flask import Flask, render_template, request, jsonify, send_file
+import time
+from flask import Flask, render_template, request, jsonify, send_file, g, Response
 import pandas as pd
 import numpy as np
 import matplotlib
@@ -19,17 +20,47 @@ from data.loader import DataLoader
 from data.processor import DataProcessor
 from models.predictor import SalesPredictor
 from models.scenario_generator import ScenarioGenerator
+from models.sensitivity import SensitivityAnalyzer, PROFILE_COLUMNS
+from models.explainer import PredictionExplainer
+from models.drift import DriftMonitor
+from models.bundle import build_model_bundle
+from visualization.chart_data import ChartDataBuilder
+from utils.cache import LRUCache
+from utils.serialization import FastJSONProvider, negotiate_format, frame_response, columnar, compress_response
+from utils.metrics import metrics
+from utils.profiler import EchoProfiler
+from utils.logger import EchoLogger
+from config import METRICS_CONFIG, SENSITIVITY_CONFIG
 
 app = Flask(__name__, template_folder='web/templates', static_folder='web/static')
+app.json = FastJSONProvider(app)
+logger = EchoLogger()
+
+# opt-in request profiling (ECHOMETRICS_PROFILE=1, ECHOMETRICS_PROFILE_SAMPLE_RATE=0.1)
+profiler = EchoProfiler()
+profiler.init_app(app)
 
 # global vars to store trained model and data
 trained_model = None
 data_processor = None
 processed_data = None
 feature_columns = []
+data_version = None
+model_version = None
+partial_dependence = {}
+sensitivity_analyzer = None
+explainer = None
+permutation_report = None
+drift_monitor = None
+chart_data_builder = ChartDataBuilder()
+sensitivity_cache = LRUCache(SENSITIVITY_CONFIG['cache_size'])
+
+CHART_TYPES = ('price_vs_sales', 'category_distribution', 'age_behavior')
 
 def initialize_system():
-    global trained_model, data_processor, processed_data, feature_columns
+    global trained_model, data_processor, processed_data, feature_columns, data_version
+    global model_version, partial_dependence, sensitivity_analyzer, explainer, permutation_report
+    global drift_monitor
     print("Initializing EchoMetrics system...")
 
     # load and process data (needed for analytics/scenarios regardless of training)
@@ -40,6 +71,8 @@ def initialize_system():
 
     data_processor = DataProcessor()
     processed_data, computed_features = data_processor.process_data(raw_data)
+    # content hash so cached aggregates are invalidated when the data changes
+    data_version = format(int(pd.util.hash_pandas_object(raw_data, index=False).sum()) & 0xffffffffffff, 'x')
 
     # try to load existing model bundle to avoid retraining
     bundle_path = Path('artifacts') / 'model_bundle.joblib'
@@ -48,6 +81,16 @@ def initialize_system():
         bundle = joblib.load(bundle_path)
         trained_model = bundle['model']
         feature_columns = bundle.get('feature_columns', computed_features)
+        # older bundles carry no version; the file timestamp is stable enough for cache keys
+        model_version = bundle.get('model_version') or format(int(bundle_path.stat().st_mtime), 'x')
+        sensitivity_analyzer = SensitivityAnalyzer(data_processor, feature_columns)
+        partial_dependence = bundle.get('partial_dependence') or \
+            sensitivity_analyzer.partial_dependence(trained_model, processed_data)
+        sensitivity_cache.clear()
+        explainer = PredictionExplainer(trained_model, feature_columns, processed_data)
+        permutation_report = bundle.get('permutation_importance')
+        drift_monitor = DriftMonitor.from_dict(bundle['drift_reference']) if bundle.get('drift_reference') \
+            else DriftMonitor.from_training_data(processed_data)
         print("Model loaded successfully. Skipping retraining.")
         return None
 
@@ -55,19 +98,62 @@ def initialize_system():
     predictor = SalesPredictor()
     trained_model = predictor.train_models(processed_data, computed_features)
     feature_columns = computed_features
+    bundle = build_model_bundle(predictor, data_processor, processed_data, feature_columns)
+    model_version = bundle['model_version']
+    sensitivity_analyzer = SensitivityAnalyzer(data_processor, feature_columns)
+    partial_dependence = bundle['partial_dependence']
+    sensitivity_cache.clear()
+    explainer = PredictionExplainer(trained_model, feature_columns, processed_data)
+    permutation_report = bundle['permutation_importance']
+    drift_monitor = DriftMonitor.from_dict(bundle['drift_reference'])
 
     artifacts_dir = Path('artifacts')
     artifacts_dir.mkdir(parents=True, exist_ok=True)
-    bundle = {
-        'model': trained_model,
-        'feature_columns': feature_columns,
-        'best_model_name': getattr(predictor, 'best_model_name', None),
-        'metrics': predictor.get_model_performance() if hasattr(predictor, 'get_model_performance') else None,
-    }
     joblib.dump(bundle, artifacts_dir / 'model_bundle.joblib')
     print("System initialized and model bundle saved.")
     return predictor
 
+def parse_profile(data): # request fields -> model input columns
+    profile = {
+        'ProductPrice': float(data['price']),
+        'CustomerAge': int(data['age']),
+        'CustomerGender': int(data['gender']),
+        'PurchaseFrequency': int(data['frequency']),
+        'CustomerSatisfaction': int(data['satisfaction']),
+        'PurchaseIntent': int(data['intent'])
+    }
+    # optional; unknown or missing values fall back to the default encoding
+    if data.get('category') is not None:
+        profile['ProductCategory'] = str(data['category'])
+    if data.get('brand') is not None:
+        profile['ProductBrand'] = str(data['brand'])
+    return profile
+
+@app.before_request
+def _start_request_timer():
+    if METRICS_CONFIG['enabled']:
+        g.request_start = time.perf_counter()
+
+@app.after_request
+def _record_request_metrics(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        # label by url rule rather than path to keep cardinality bounded
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.latency.observe(time.perf_counter() - start, route, request.method)
+        metrics.requests.inc(route, request.method, str(response.status_code))
+        if response.status_code >= 400:
+            metrics.errors.inc(route, request.method)
+    return response
+
+@app.after_request
+def _compress_response(response):
+    return compress_response(request, response)
+
+@app.route('/metrics')
+def get_metrics(): # prometheus text exposition
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/')
 def index(): # main dashboard page
     return render_template('index.html')
@@ -78,38 +164,146 @@ def predict_sales(): # api endpoint for sales prediction
         data = request.json
         
         # create input dataframe
-        input_data = pd.DataFrame([{
-            'ProductPrice': float(data['price']),
-            'CustomerAge': int(data['age']),
-            'CustomerGender': int(data['gender']),
-            'PurchaseFrequency': int(data['frequency']),
-            'CustomerSatisfaction': int(data['satisfaction']),
-            'PurchaseIntent': int(data['intent'])
-        }])
-        
-        # feature engineering
-        input_data = data_processor.create_sales_target(input_data)
-        
-        # provide default categorical values required by encoder
-        # NOTE: encode_categorical_features expects raw columns 'ProductCategory' and 'ProductBrand'
-        # so they must be set before encoding to avoid KeyError
-        input_data['ProductCategory'] = 'Predicted'
-        input_data['ProductBrand'] = 'Predicted'
-        
-        # optional: defaults for encoded columns (will be recomputed by encoder)
-        input_data['category_encoded'] = 0  # default category
-        input_data['brand_encoded'] = 0     # default brand
-        
-        input_data = data_processor.encode_categorical_features(input_data)
-        input_data = data_processor.create_behavioral_features(input_data)
+        profile = parse_profile(data)
+        drift_monitor.update(profile)
+        input_data = pd.DataFrame([profile])
         
-        # make prediction
+        # feature engineering (categories/price tiers encoded against the training data)
+        fe_start = time.perf_counter()
+        input_data = data_processor.transform(input_data)
         X_input = input_data[feature_columns]
-        prediction = trained_model.predict(X_input)[0]
+        metrics.stage_latency.observe(time.perf_counter() - fe_start, 'predict_feature_engineering')
         
-        return jsonify({
+        # make prediction
+        with metrics.stage_latency.time('predict_model'):
+            prediction = trained_model.predict(X_input)[0]
+        logger.debug("Prediction served", prediction=float(prediction), inputs=data)
+        
+        response = {
             'prediction': round(prediction, 2),
             'status': 'success'
+        }
+        
+        # optional per-feature breakdown: prediction = base_value + sum(contributions)
+        if data.get('explain'):
+            with metrics.stage_latency.time('predict_explain'):
+                response['explanation'] = explainer.explain(X_input)[0]
+        
+        return jsonify(response)
+        
+    except Exception as e:
+        logger.warning(f"Prediction request failed: {e}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_sales_batch(): # many profiles scored with one predict call
+    try:
+        rows = request.json['rows']
+        profiles = [parse_profile(row) for row in rows]
+        for profile in profiles:
+            drift_monitor.update(profile)
+        
+        input_data = pd.DataFrame(profiles)
+        X_input = data_processor.transform(input_data)[feature_columns]
+        with metrics.stage_latency.time('predict_batch_model'):
+            input_data['predicted_sales'] = np.round(trained_model.predict(X_input), 2)
+        
+        return frame_response(input_data, 'predictions', negotiate_format(request))
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
+@app.route('/api/sensitivity', methods=['POST'])
+def get_sensitivity(): # predicted sales across one feature's range for a fixed profile
+    try:
+        data = request.json
+        feature = data['feature']
+        if feature not in PROFILE_COLUMNS:
+            raise ValueError(f"Unknown feature '{feature}', expected one of {list(PROFILE_COLUMNS)}")
+
+        # quantize so near-identical requests share a cache entry
+        profile = {key: sensitivity_analyzer.quantize(key, data['profile'][key]) for key in PROFILE_COLUMNS}
+        # optional categoricals, encoded the same way as in /api/predict
+        for key in ('category', 'brand'):
+            if data['profile'].get(key) is not None:
+                profile[key] = str(data['profile'][key])
+        low = sensitivity_analyzer.quantize(feature, data['min']) if data.get('min') is not None else None
+        high = sensitivity_analyzer.quantize(feature, data['max']) if data.get('max') is not None else None
+        points = sensitivity_analyzer.clamp_points(data.get('points'))
+
+        def compute():
+            values = sensitivity_analyzer.feature_grid(feature, processed_data, low, high, points)
+            predictions = sensitivity_analyzer.curve(trained_model, parse_profile(profile), feature, values)
+            return {
+                'values': np.round(values, 4).tolist(),
+                'predictions': np.round(predictions, 2).tolist()
+            }
+
+        # curve() overwrites the varied column, so its base value doesn't change the result
+        fixed = tuple(sorted(item for item in profile.items() if item[0] != feature))
+        key = (model_version, feature, fixed, low, high, points)
+        curve, hit = sensitivity_cache.get_or_compute(key, compute)
+        metrics.record_cache('sensitivity', hit)
+
+        return jsonify({
+            'feature': feature,
+            'profile': profile,
+            'curve': curve,
+            'partial_dependence': partial_dependence.get(feature),
+            'model_version': model_version,
+            'status': 'success'
+        })
+
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
+@app.route('/api/feature-importance')
+def get_feature_importance(): # permutation importance computed at training time
+    if permutation_report is None:
+        return jsonify({
+            'error': 'No permutation importance in the model bundle; retrain to generate it',
+            'status': 'error'
+        }), 404
+    
+    return jsonify({
+        'feature_importance': permutation_report,
+        'model_version': model_version,
+        'status': 'success'
+    })
+
+@app.route('/api/drift')
+def get_drift_report(): # live /api/predict inputs vs the training distribution
+    try:
+        return jsonify({
+            'drift': drift_monitor.report(),
+            'model_version': model_version,
+            'status': 'success'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
+@app.route('/api/drift/reset', methods=['POST'])
+def reset_drift_window(): # close the current window and return its final report
+    try:
+        report = drift_monitor.report_and_reset()
+        
+        return jsonify({
+            'drift': report,
+            'model_version': model_version,
+            'status': 'success'
         })
         
     except Exception as e:
@@ -126,10 +320,7 @@ def get_scenarios(): # get top sales scenarios
             trained_model, processed_data, feature_columns
         )
         
-        return jsonify({
-            'scenarios': scenarios.to_dict('records'),
-            'status': 'success'
-        })
+        return frame_response(scenarios, 'scenarios', negotiate_format(request))
         
     except Exception as e:
         return jsonify({
@@ -140,11 +331,20 @@ def get_scenarios(): # get top sales scenarios
 @app.route('/api/analytics')
 def get_analytics(): # get analytics for the dashboard
     try:
+        response_format = negotiate_format(request)
+        if response_format == 'arrow':
+            return jsonify({
+                'error': 'Analytics are not tabular; request JSON or columnar JSON',
+                'status': 'error'
+            }), 406
+        
+        category_counts = processed_data['ProductCategory'].value_counts()
         analytics = {
             'total_records': len(processed_data),
             'avg_sales_potential': round(processed_data['sales_potential'].mean(), 2),
             'max_sales_potential': round(processed_data['sales_potential'].max(), 2),
-            'categories': processed_data['ProductCategory'].value_counts().to_dict(),
+            'categories': category_counts.to_dict() if response_format == 'records' else
+                columnar(category_counts.rename_axis('category').reset_index(name='count')),
             'price_range': {
                 'min': round(processed_data['ProductPrice'].min(), 2),
                 'max': round(processed_data['ProductPrice'].max(), 2),
@@ -166,6 +366,7 @@ def get_analytics(): # get analytics for the dashboard
 @app.route('/api/chart/<chart_type>')
 def generate_chart(chart_type): # base64 imgs
     try:
+        render_start = time.perf_counter()
         plt.figure(figsize=(10, 6))
         
         if chart_type == 'price_vs_sales':
@@ -200,6 +401,8 @@ def generate_chart(chart_type): # base64 imgs
         img_buffer.seek(0)
         img_base64 = base64.b64encode(img_buffer.getvalue()).decode()
         plt.close()
+        chart_label = chart_type if chart_type in CHART_TYPES else 'other'
+        metrics.chart_render.observe(time.perf_counter() - render_start, chart_label)
         
         return jsonify({
             'chart': f"data:image/png;base64,{img_base64}",
@@ -212,6 +415,27 @@ def generate_chart(chart_type): # base64 imgs
             'status': 'error'
         }), 400
 
+@app.route('/api/chart-data/<chart_type>')
+def get_chart_data(chart_type): # pre-binned aggregates for client-side rendering
+    try:
+        chart_data, hit = chart_data_builder.get(chart_type, processed_data, data_version)
+        metrics.record_cache('chart_data', hit)
+
+        response = jsonify({
+            'chart_data': chart_data,
+            'data_version': data_version,
+            'status': 'success'
+        })
+        response.set_etag(f"{data_version}-{chart_type}")
+        response.cache_control.no_cache = True  # revalidate, but 304 when unchanged
+        return response.make_conditional(request)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+
 if __name__ == '__main__':
     # init system
     predictor = initialize_system()
@@ -28,7 +28,13 @@ VIZ_CONFIG = {
     'figure_size': (15, 7),
     'color_palette': 'viridis',
     'alpha': 0.6,
-    'grid_alpha': 0.3
+    'grid_alpha': 0.3,
+    'output_dir': 'artifacts/plots',
+    'output_format': 'png',  # 'png' or 'svg' in headless mode
+    'panel_size': (7, 5),
+    'render_workers': None,  # defaults to one process per panel, capped at cpu count
+    'density_threshold': 50000,  # scatter panels switch to hexbin above this many rows
+    'hexbin_gridsize': 60
 }
 
 DATASET_CONFIG = {
@@ -36,3 +42,104 @@ DATASET_CONFIG = {
     'target_variable': 'sales_potential',
     'prediction_scenarios': 10
 }
+
+METRICS_CONFIG = {
+    'enabled': True,
+    'latency_buckets': [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+}
+
+PROFILING_CONFIG = {
+    'enabled': False,
+    'sample_rate': 0.1,
+    'output_dir': 'artifacts/profiles',
+    'tracemalloc_frames': 10
+}
+
+LOGGING_CONFIG = {
+    'level': 'INFO',  # lowered to DEBUG while debug_sample_rate > 0
+    'async': True,
+    'json': True,
+    'log_dir': 'logs',
+    'file_name': 'echometrics.log',
+    'rotation': 'size',  # 'size' or 'time'
+    'max_bytes': 10 * 1024 * 1024,
+    'rotate_when': 'midnight',
+    'backup_count': 7,
+    'debug_sample_rate': 0.01
+}
+
+CHART_DATA_CONFIG = {
+    'bins': 40,
+    'decimals': 4
+}
+
+SWEEP_CONFIG = {
+    # value grids; None means derive from the training data
+    'grid': {
+        'price': None,  # evenly spaced over the observed price range
+        'age': list(range(18, 71, 2)),
+        'gender': [0, 1],
+        'frequency': list(range(1, 21)),
+        'satisfaction': [1, 2, 3, 4, 5],
+        'intent': [0, 1],
+        'category': None,  # every category in the data
+        'brand': None  # every brand in the data
+    },
+    'price_points': 50,
+    'chunk_size': 200000,
+    'top_k': 10,
+    'n_jobs': None  # None uses every core
+}
+
+SENSITIVITY_CONFIG = {
+    'default_points': 25,
+    'max_points': 200,
+    'cache_size': 1024,
+    # request values are rounded to these steps before the cache lookup
+    'quantization': {
+        'price': 1.0,
+        'age': 1,
+        'gender': 1,
+        'frequency': 1,
+        'satisfaction': 1,
+        'intent': 1
+    },
+    'pd_sample_rows': 500,
+    'pd_points': 20,
+    'random_state': 42
+}
+
+IMPORTANCE_CONFIG = {
+    'n_repeats': 5,
+    'n_jobs': -1,  # features are permuted in parallel across all cores
+    'max_samples': 5000,
+    'random_state': 42
+}
+
+DRIFT_CONFIG = {
+    'numeric_features': ['ProductPrice', 'CustomerAge', 'PurchaseFrequency'],
+    'categorical_features': [
+        'CustomerGender', 'CustomerSatisfaction', 'PurchaseIntent', 'ProductCategory', 'ProductBrand'
+    ],
+    'bins': 10,  # quantile bins of the training data
+    'max_categories': 50,
+    'min_samples': 100,  # live observations needed before a feature is scored
+    'psi_warn': 0.1,
+    'psi_alert': 0.2,
+    'psi_epsilon': 0.5
+}
+
+SERIALIZATION_CONFIG = {
+    'min_compress_bytes': 1024,
+    'compression_level': 5,
+    'compressible_mimetypes': [
+        'application/json',
+        'application/vnd.echometrics.columnar+json',
+        'application/vnd.apache.arrow.stream',
+        'text/plain',
+        'text/html',
+        'text/css',
+        'application/javascript',
+        'text/javascript'
+    ]
+}
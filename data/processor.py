@@ -10,6 +10,10 @@ class DataProcessor:
     
     def __init__(self):
         self.feature_columns = []
+        # training-time encodings, reused when transforming new rows
+        self.category_levels = None
+        self.brand_levels = None
+        self.price_bins = None
         
     def create_sales_target(self, df): # webpage first prediction
         df = df.copy()
@@ -20,12 +24,12 @@ class DataProcessor:
         )
         return df
     
-    def encode_categorical_features(self, df):
+    def encode_categorical_features(self, df, category_levels=None, brand_levels=None):
         df = df.copy()
         
-        # encode product categories and brands
-        df['category_encoded'] = pd.Categorical(df['ProductCategory']).codes
-        df['brand_encoded'] = pd.Categorical(df['ProductBrand']).codes
+        # encode product categories and brands (pass the training levels to keep codes stable)
+        df['category_encoded'] = pd.Categorical(df['ProductCategory'], categories=category_levels).codes
+        df['brand_encoded'] = pd.Categorical(df['ProductBrand'], categories=brand_levels).codes
         
         # age segments
         df['age_segment'] = pd.cut(
@@ -37,7 +41,7 @@ class DataProcessor:
         
         return df
     
-    def create_behavioral_features(self, df):
+    def create_behavioral_features(self, df, price_bins=None):
         df = df.copy()
 
         df['behavior_score'] = (
@@ -48,7 +52,7 @@ class DataProcessor:
 
         df['price_tier'] = pd.cut(
             df['ProductPrice'], 
-            bins=DATA_CONFIG['price_bins'], 
+            bins=DATA_CONFIG['price_bins'] if price_bins is None else price_bins, 
             labels=['Budget', 'Low', 'Mid', 'High', 'Premium']
         )
 
@@ -66,6 +70,31 @@ class DataProcessor:
         
         return df
     
+    def get_price_bins(self, df):
+        # training price tier edges, widened so out-of-range prices land in the end tiers
+        _, edges = pd.cut(df['ProductPrice'], bins=DATA_CONFIG['price_bins'], retbins=True)
+        edges[0], edges[-1] = -np.inf, np.inf
+        return edges
+    
+    def fit_encodings(self, df):
+        self.category_levels = pd.Categorical(df['ProductCategory']).categories
+        self.brand_levels = pd.Categorical(df['ProductBrand']).categories
+        self.price_bins = self.get_price_bins(df)
+    
+    def transform(self, df): # feature engineering for new rows, encoded like the training data
+        df = self.create_sales_target(df)
+        
+        # rows without a category/brand get a placeholder, which falls back to code 0
+        for column in ('ProductCategory', 'ProductBrand'):
+            if column not in df.columns:
+                df[column] = 'Predicted'
+        
+        df = self.encode_categorical_features(df, self.category_levels, self.brand_levels)
+        df['category_encoded'] = df['category_encoded'].clip(lower=0)
+        df['brand_encoded'] = df['brand_encoded'].clip(lower=0)
+        
+        return self.create_behavioral_features(df, self.price_bins)
+    
     def get_feature_columns(self):
         return [
             'ProductPrice', 'CustomerAge', 'CustomerGender', 'PurchaseFrequency', 
@@ -77,6 +106,7 @@ class DataProcessor:
     def process_data(self, df):
         print("\n=== Processing Data ===")
         
+        self.fit_encodings(df)
         df = self.create_sales_target(df)
         print(f"Sales potential range: ${df['sales_potential'].min():.2f} - ${df['sales_potential'].max():.2f}")
         
@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 import sys
 import os
+import argparse
 import warnings
 
 from data.loader import DataLoader
 from data.processor import DataProcessor
 from models.predictor import SalesPredictor
 from models.scenario_generator import ScenarioGenerator
+from models.bundle import build_model_bundle
 from visualization.plotter import SalesVisualizer
 from utils.logger import EchoLogger
+from utils.profiler import EchoProfiler
 import joblib
 from pathlib import Path
 
@@ -17,17 +20,24 @@ warnings.filterwarnings('ignore')
 
 class EchoMetrics:
     
-    def __init__(self):
+    def __init__(self, profiler=None, visualizer=None, sweep=False):
         self.logger = EchoLogger()
+        self.profiler = profiler or EchoProfiler()
         self.data_loader = DataLoader()
         self.data_processor = DataProcessor()
         self.predictor = SalesPredictor()
         self.scenario_generator = ScenarioGenerator()
-        self.visualizer = SalesVisualizer()
+        self.visualizer = visualizer or SalesVisualizer()
         
         self.raw_data = None
         self.processed_data = None
         self.feature_columns = []
+        self.sweep = sweep
+
+        self.profiler.instrument(self, [
+            '_load_data', '_process_data', '_train_models',
+            '_generate_predictions', '_create_visualizations', '_save_results'
+        ])
     
     def run_prediction_pipeline(self):
         try:
@@ -66,6 +76,15 @@ class EchoMetrics:
             raise ValueError("Model training failed")
     
     def _generate_predictions(self):
+        if self.sweep:
+            self.scenario_predictions = self.scenario_generator.sweep(
+                self.predictor.best_model,
+                self.processed_data,
+                self.feature_columns,
+                processor=self.data_processor
+            )
+            return
+
         self.scenario_predictions = self.scenario_generator.generate_predictions(
             self.predictor.best_model, 
             self.processed_data, 
@@ -104,18 +123,35 @@ class EchoMetrics:
         artifacts_dir = Path('artifacts')
         artifacts_dir.mkdir(parents=True, exist_ok=True)
         bundle_path = artifacts_dir / 'model_bundle.joblib'
-        bundle = {
-            'model': self.predictor.best_model,
-            'feature_columns': self.feature_columns,
-            'best_model_name': self.predictor.best_model_name,
-            'metrics': {k: {m: v for m, v in self.predictor.results[k].items() if m in ['MAE', 'MSE', 'R2']} for k in self.predictor.results}
-        }
+        bundle = build_model_bundle(self.predictor, self.data_processor, self.processed_data, self.feature_columns)
         joblib.dump(bundle, bundle_path)
         print(f"Model bundle saved to '{bundle_path}'")
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='EchoMetrics sales prediction pipeline')
+    parser.add_argument('--profile', action='store_true', default=None,
+                        help='profile each pipeline stage with cProfile and tracemalloc')
+    parser.add_argument('--profile-dir', default=None,
+                        help='directory for .prof and allocation snapshots (default: artifacts/profiles)')
+    parser.add_argument('--sweep', action='store_true',
+                        help='search the full SWEEP_CONFIG scenario grid instead of the default scenarios')
+    parser.add_argument('--headless', action='store_true',
+                        help='render plots to files in parallel instead of opening windows')
+    parser.add_argument('--plot-dir', default=None,
+                        help='output directory for headless plots (default: artifacts/plots)')
+    parser.add_argument('--plot-format', choices=['png', 'svg'], default=None,
+                        help='file format for headless plots (default: png)')
+    return parser.parse_args()
+
+
 def main():
-    app = EchoMetrics()
+    args = parse_args()
+    profiler = EchoProfiler(enabled=args.profile, output_dir=args.profile_dir)
+    visualizer = SalesVisualizer(
+        headless=args.headless, output_dir=args.plot_dir, output_format=args.plot_format
+    )
+    app = EchoMetrics(profiler=profiler, visualizer=visualizer, sweep=args.sweep)
     app.run_prediction_pipeline()
 
 
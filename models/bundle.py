@@ -0,0 +1,23 @@
+import sys
+import os
+from datetime import datetime
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+from models.sensitivity import SensitivityAnalyzer
+from models.drift import DriftMonitor
+
+
+def build_model_bundle(predictor, processor, processed_data, feature_columns):
+    # everything the web app restores from artifacts/model_bundle.joblib, built the same
+    # way whether the CLI pipeline or the app trained the model
+    analyzer = SensitivityAnalyzer(processor, feature_columns)
+    importance = predictor.get_permutation_importance()
+    return {
+        'model': predictor.best_model,
+        'feature_columns': feature_columns,
+        'best_model_name': predictor.best_model_name,
+        'metrics': {k: {m: v for m, v in predictor.results[k].items() if m in ['MAE', 'MSE', 'R2']} for k in predictor.results},
+        'model_version': datetime.now().strftime('%Y%m%d%H%M%S'),
+        'partial_dependence': analyzer.partial_dependence(predictor.best_model, processed_data),
+        'permutation_importance': importance.to_dict('records') if importance is not None else None,
+        'drift_reference': DriftMonitor.from_training_data(processed_data).to_dict()
+    }
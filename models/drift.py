@@ -0,0 +1,161 @@
+import bisect
+import threading
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+from config import DRIFT_CONFIG
+
+OTHER = '__other__'
+
+
+def _psi(reference, live):
+    # population stability index over matching bins, smoothed so empty bins stay finite
+    eps = DRIFT_CONFIG['psi_epsilon']
+    ref = np.asarray(reference, dtype=float)
+    cur = np.asarray(live, dtype=float)
+    ref = (ref + eps) / (ref.sum() + eps * len(ref))
+    cur = (cur + eps) / (cur.sum() + eps * len(cur))
+    return float(np.sum((cur - ref) * np.log(cur / ref)))
+
+
+class FeatureHistogram:
+    # fixed bin edges; counts has an underflow and an overflow slot
+
+    def __init__(self, edges, counts=None):
+        self.edges = [float(e) for e in edges]
+        self.counts = list(counts) if counts is not None else [0] * (len(self.edges) + 1)
+
+    @classmethod
+    def from_values(cls, values, bins):
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+        histogram = cls(edges)
+        idx = np.searchsorted(histogram.edges, values, side='right')
+        histogram.counts = np.bincount(idx, minlength=len(histogram.edges) + 1).tolist()
+        return histogram
+
+    def empty_like(self):
+        return FeatureHistogram(self.edges)
+
+    def update(self, value):
+        self.counts[bisect.bisect_right(self.edges, value)] += 1
+
+    def bins(self):
+        return self.counts
+
+    def to_dict(self):
+        return {'type': 'histogram', 'edges': self.edges, 'counts': self.counts}
+
+
+class CategoryCounter:
+    # fixed set of levels taken from the reference; anything else lands in OTHER
+
+    def __init__(self, levels, counts=None):
+        self.levels = [str(level) for level in levels]
+        self.counts = dict(counts) if counts is not None else {level: 0 for level in self.levels + [OTHER]}
+
+    @classmethod
+    def from_values(cls, values, max_levels):
+        values = values.astype(str)
+        top = values.value_counts().head(max_levels)
+        counter = cls(top.index)
+        counter.counts.update({str(k): int(v) for k, v in top.items()})
+        counter.counts[OTHER] = int(len(values) - top.sum())
+        return counter
+
+    def empty_like(self):
+        return CategoryCounter(self.levels)
+
+    def update(self, value):
+        key = str(value)
+        self.counts[key if key in self.counts else OTHER] += 1
+
+    def bins(self):
+        return [self.counts[level] for level in self.levels + [OTHER]]
+
+    def to_dict(self):
+        return {'type': 'categorical', 'levels': self.levels, 'counts': self.counts}
+
+
+def _sketch_from_dict(data):
+    if data['type'] == 'histogram':
+        return FeatureHistogram(data['edges'], data['counts'])
+    return CategoryCounter(data['levels'], data['counts'])
+
+
+class DriftMonitor:
+    # live-traffic sketches compared against training-time reference sketches
+
+    def __init__(self, reference):
+        self.reference = reference  # column -> sketch
+        self._lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def from_training_data(cls, df):
+        reference = {}
+        for column in DRIFT_CONFIG['numeric_features']:
+            reference[column] = FeatureHistogram.from_values(df[column].to_numpy(dtype=float), DRIFT_CONFIG['bins'])
+        for column in DRIFT_CONFIG['categorical_features']:
+            reference[column] = CategoryCounter.from_values(df[column], DRIFT_CONFIG['max_categories'])
+        return cls(reference)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls({column: _sketch_from_dict(sketch) for column, sketch in data.items()})
+
+    def to_dict(self):
+        return {column: sketch.to_dict() for column, sketch in self.reference.items()}
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self.live = {column: sketch.empty_like() for column, sketch in self.reference.items()}
+        self.observations = 0
+
+    def _snapshot(self):
+        return {column: list(sketch.bins()) for column, sketch in self.live.items()}, self.observations
+
+    def update(self, row):
+        # one bin increment per tracked feature that the row carries
+        with self._lock:
+            for column, sketch in self.live.items():
+                value = row.get(column)
+                if value is not None:
+                    sketch.update(value)
+            self.observations += 1
+
+    def report(self):
+        with self._lock:
+            live_bins, observations = self._snapshot()
+        return self._build_report(live_bins, observations)
+
+    def report_and_reset(self):
+        # snapshot and clear under one lock so no update falls between two windows
+        with self._lock:
+            live_bins, observations = self._snapshot()
+            self._clear()
+        return self._build_report(live_bins, observations)
+
+    def _build_report(self, live_bins, observations):
+        features = {}
+        for column, reference in self.reference.items():
+            live = live_bins[column]
+            samples = int(sum(live))
+            if samples < DRIFT_CONFIG['min_samples']:
+                status, psi = 'insufficient_data', None
+            else:
+                psi = round(_psi(reference.bins(), live), 4)
+                status = 'drift' if psi >= DRIFT_CONFIG['psi_alert'] else \
+                    'warning' if psi >= DRIFT_CONFIG['psi_warn'] else 'stable'
+            features[column] = {'psi': psi, 'status': status, 'samples': samples}
+
+        drifted = [column for column, result in features.items() if result['status'] == 'drift']
+        return {
+            'observations': observations,
+            'features': features,
+            'drifted_features': drifted,
+            'retrain_recommended': bool(drifted)
+        }
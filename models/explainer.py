@@ -0,0 +1,78 @@
+import pandas as pd
+import numpy as np
+from scipy import sparse
+
+
+class PredictionExplainer:
+    # per-prediction feature contributions: prediction = base_value + sum(contributions)
+
+    def __init__(self, model, feature_columns, reference_df):
+        self.model = model
+        self.feature_columns = list(feature_columns)
+
+        if hasattr(model, 'estimators_') or hasattr(model, 'tree_'):
+            self.kind = 'tree'
+            self._build_tree_paths()
+        elif hasattr(model, 'coef_'):
+            self.kind = 'linear'
+            # centre on the training means so each term reads as "vs. an average row"
+            self.feature_means = reference_df[self.feature_columns].mean().to_numpy()
+            self.coef = np.ravel(model.coef_)
+            self.base_value = float(np.ravel(model.intercept_)[0] + self.coef @ self.feature_means)
+        else:
+            raise ValueError(f"Cannot explain model of type {type(model).__name__}")
+
+    def _build_tree_paths(self):
+        # one sparse (node x feature) matrix holding value(node) - value(parent) on the
+        # parent's split feature; decision_path @ deltas then sums every path at once
+        trees = [est.tree_ for est in self.model.estimators_] if hasattr(self.model, 'estimators_') \
+            else [self.model.tree_]
+
+        rows, cols, deltas, roots = [], [], [], []
+        offset = 0
+        for tree in trees:
+            values = tree.value[:, 0, 0]
+            internal = np.flatnonzero(tree.children_left != -1)
+            parent = np.full(tree.node_count, -1)
+            parent[tree.children_left[internal]] = internal
+            parent[tree.children_right[internal]] = internal
+
+            children = np.flatnonzero(parent >= 0)
+            rows.append(children + offset)
+            cols.append(tree.feature[parent[children]])
+            deltas.append(values[children] - values[parent[children]])
+            roots.append(values[0])
+            offset += tree.node_count
+
+        self.n_trees = len(trees)
+        self.path_deltas = sparse.csr_matrix(
+            (np.concatenate(deltas), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(offset, len(self.feature_columns))
+        )
+        self.base_value = float(np.mean(roots))
+
+    def contributions(self, X):
+        X = X[self.feature_columns] if isinstance(X, pd.DataFrame) else X
+
+        if self.kind == 'linear':
+            return (np.asarray(X, dtype=float) - self.feature_means) * self.coef
+
+        if hasattr(self.model, 'estimators_'):
+            indicator, _ = self.model.decision_path(X)
+        else:
+            indicator = self.model.decision_path(X)
+        return np.asarray((indicator @ self.path_deltas).todense()) / self.n_trees
+
+    def explain(self, X):
+        # one dict per row, largest absolute contribution first
+        contributions = self.contributions(X)
+        return [
+            {
+                'base_value': round(self.base_value, 4),
+                'contributions': [
+                    {'feature': self.feature_columns[j], 'contribution': round(float(row[j]), 4)}
+                    for j in np.argsort(-np.abs(row))
+                ]
+            }
+            for row in contributions
+        ]
@@ -4,10 +4,11 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.inspection import permutation_importance
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-from config import MODEL_CONFIG, DATA_CONFIG
+from config import MODEL_CONFIG, DATA_CONFIG, IMPORTANCE_CONFIG
 
 
 class SalesPredictor:
@@ -18,6 +19,8 @@ class SalesPredictor:
         self.best_model_name = None
         self.feature_columns = []
         self.results = {}
+        self.X_test = None
+        self.permutation_importance = None
     
     def initialize_models(self):
         self.models = {
@@ -29,6 +32,7 @@ class SalesPredictor:
         print("\n=== Training Models ===")
         
         self.feature_columns = feature_columns
+        self.permutation_importance = None
         
         # prepare features and target
         X = df[feature_columns]
@@ -44,6 +48,7 @@ class SalesPredictor:
             random_state=DATA_CONFIG['random_state']
         )
         
+        self.X_test = X_test
         self.initialize_models()
         
         # train and evaluate each model
@@ -83,8 +88,13 @@ class SalesPredictor:
         return self.best_model
     
     def get_feature_importance(self):
-        if self.best_model is None or not hasattr(self.best_model, 'feature_importances_'):
+        if self.best_model is None:
             return None
+        
+        # linear models have no impurity importances; fall back to permutation importance
+        if not hasattr(self.best_model, 'feature_importances_'):
+            report = self.get_permutation_importance()
+            return report[['feature', 'importance']] if report is not None else None
             
         importance_df = pd.DataFrame({
             'feature': self.feature_columns,
@@ -93,6 +103,30 @@ class SalesPredictor:
         
         return importance_df
     
+    def get_permutation_importance(self):
+        # held-out R² drop when each feature is shuffled, computed once per training run
+        if self.permutation_importance is not None:
+            return self.permutation_importance
+        if self.best_model is None or self.X_test is None:
+            return None
+        
+        y_test = self.results[self.best_model_name]['y_test']
+        result = permutation_importance(
+            self.best_model, self.X_test, y_test,
+            n_repeats=IMPORTANCE_CONFIG['n_repeats'],
+            n_jobs=IMPORTANCE_CONFIG['n_jobs'],
+            max_samples=min(IMPORTANCE_CONFIG['max_samples'], len(self.X_test)),
+            random_state=IMPORTANCE_CONFIG['random_state']
+        )
+        
+        self.permutation_importance = pd.DataFrame({
+            'feature': self.feature_columns,
+            'importance': result.importances_mean,
+            'importance_std': result.importances_std
+        }).sort_values('importance', ascending=False)
+        
+        return self.permutation_importance
+    
     def predict(self, X):
         if self.best_model is None:
             raise ValueError("No trained model available. Train models first.")
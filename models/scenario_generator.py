@@ -1,9 +1,70 @@
 import pandas as pd
 import numpy as np
+import heapq
+import itertools
+import multiprocessing
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-from config import DATASET_CONFIG
+from config import DATASET_CONFIG, SWEEP_CONFIG
+
+# sweep grid key -> input column
+GRID_COLUMNS = {
+    'price': 'ProductPrice',
+    'age': 'CustomerAge',
+    'gender': 'CustomerGender',
+    'frequency': 'PurchaseFrequency',
+    'satisfaction': 'CustomerSatisfaction',
+    'intent': 'PurchaseIntent',
+    'category': 'ProductCategory',
+    'brand': 'ProductBrand'
+}
+
+_sweep_evaluator = None
+
+
+class SweepEvaluator:
+    # scores one slice of the flattened cartesian product; picklable so workers get it once
+
+    def __init__(self, model, feature_columns, grid, processor):
+        self.model = model
+        self.feature_columns = feature_columns
+        self.keys = list(grid.keys())
+        self.values = [np.asarray(grid[key]) for key in self.keys]
+        self.shape = tuple(len(v) for v in self.values)
+        self.processor = processor  # fitted DataProcessor
+
+    def evaluate(self, start, stop, top_k):
+        positions = np.unravel_index(np.arange(start, stop), self.shape)
+        chunk = pd.DataFrame({
+            GRID_COLUMNS[key]: values[idx]
+            for key, values, idx in zip(self.keys, self.values, positions)
+        })
+
+        chunk = self.processor.transform(chunk)
+        predictions = self.model.predict(chunk[self.feature_columns])
+
+        # local top-k only; the caller merges chunks
+        if len(predictions) > top_k:
+            best = np.argpartition(predictions, -top_k)[-top_k:]
+        else:
+            best = np.arange(len(predictions))
+
+        inputs = chunk[[GRID_COLUMNS[key] for key in self.keys]].iloc[best]
+        return [
+            (float(predictions[i]), start + int(i), row)
+            for i, row in zip(best, inputs.itertuples(index=False, name=None))
+        ]
+
+
+def _init_sweep_worker(evaluator):
+    global _sweep_evaluator
+    _sweep_evaluator = evaluator
+
+
+def _evaluate_sweep_chunk(start, stop, top_k):
+    return _sweep_evaluator.evaluate(start, stop, top_k)
 
 
 class ScenarioGenerator:
@@ -84,3 +145,77 @@ class ScenarioGenerator:
         ].head(DATASET_CONFIG['prediction_scenarios'])
         
         return top_scenarios
+
+    def build_sweep_grid(self, df, grid=None):
+        grid = {**SWEEP_CONFIG['grid'], **(grid or {})}
+
+        if grid['price'] is None:
+            grid['price'] = np.round(np.linspace(
+                df['ProductPrice'].min(), df['ProductPrice'].max(), SWEEP_CONFIG['price_points']
+            ), 2)
+        if grid['category'] is None:
+            grid['category'] = df['ProductCategory'].unique()
+        if grid['brand'] is None:
+            grid['brand'] = df['ProductBrand'].unique()
+
+        unknown = set(grid) - set(GRID_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown sweep grid keys: {sorted(unknown)}")
+        return grid
+
+    def sweep(self, model, df, feature_columns, grid=None, top_k=None, chunk_size=None, n_jobs=None,
+              processor=None):
+        print(f"\n=== Sweeping Scenario Grid ===")
+
+        grid = self.build_sweep_grid(df, grid)
+        top_k = top_k or SWEEP_CONFIG['top_k']
+        chunk_size = chunk_size or SWEEP_CONFIG['chunk_size']
+        n_jobs = n_jobs or SWEEP_CONFIG['n_jobs'] or os.cpu_count() or 1
+
+        # encode against the training data so codes match what the model saw
+        if processor is None or processor.price_bins is None:
+            from data.processor import DataProcessor
+            processor = DataProcessor()
+            processor.fit_encodings(df)
+        evaluator = SweepEvaluator(model, feature_columns, grid, processor)
+
+        total = int(np.prod(evaluator.shape, dtype=np.int64))
+        chunks = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+        print(f"Evaluating {total:,} combinations in {len(chunks)} chunks on {min(n_jobs, len(chunks))} workers")
+
+        heap = []  # min-heap of the best k (prediction, position, row)
+        def merge(results):
+            for item in results:
+                if len(heap) < top_k:
+                    heapq.heappush(heap, item)
+                elif item[0] > heap[0][0]:
+                    heapq.heapreplace(heap, item)
+
+        if n_jobs == 1 or len(chunks) == 1:
+            for start, stop in chunks:
+                merge(evaluator.evaluate(start, stop, top_k))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(n_jobs, len(chunks)),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_sweep_worker,
+                initargs=(evaluator,)
+            ) as executor:
+                # keep a bounded number of chunks in flight so memory stays flat
+                pending = set()
+                chunk_iter = iter(chunks)
+                for start, stop in itertools.islice(chunk_iter, n_jobs * 2):
+                    pending.add(executor.submit(_evaluate_sweep_chunk, start, stop, top_k))
+                while pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        merge(future.result())
+                        next_chunk = next(chunk_iter, None)
+                        if next_chunk is not None:
+                            pending.add(executor.submit(_evaluate_sweep_chunk, *next_chunk, top_k))
+
+        columns = [GRID_COLUMNS[key] for key in evaluator.keys]
+        best = sorted(heap, key=lambda item: (-item[0], item[1]))
+        top_scenarios = pd.DataFrame([row for _, _, row in best], columns=columns)
+        top_scenarios['predicted_sales'] = [prediction for prediction, _, _ in best]
+        return top_scenarios
@@ -0,0 +1,70 @@
+import pandas as pd
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+from config import SENSITIVITY_CONFIG
+
+# request field -> input column
+PROFILE_COLUMNS = {
+    'price': 'ProductPrice',
+    'age': 'CustomerAge',
+    'gender': 'CustomerGender',
+    'frequency': 'PurchaseFrequency',
+    'satisfaction': 'CustomerSatisfaction',
+    'intent': 'PurchaseIntent'
+}
+
+
+class SensitivityAnalyzer:
+
+    def __init__(self, processor, feature_columns):
+        self.processor = processor  # fitted DataProcessor
+        self.feature_columns = feature_columns
+
+    def quantize(self, feature, value):
+        step = SENSITIVITY_CONFIG['quantization'].get(feature, 1)
+        return round(round(float(value) / step) * step, 6)
+
+    def clamp_points(self, points):
+        points = min(int(points or SENSITIVITY_CONFIG['default_points']), SENSITIVITY_CONFIG['max_points'])
+        return max(points, 2)
+
+    def feature_grid(self, feature, df, low=None, high=None, points=None):
+        column = PROFILE_COLUMNS[feature]
+        low = df[column].min() if low is None else low
+        high = df[column].max() if high is None else high
+
+        values = np.linspace(float(low), float(high), self.clamp_points(points))
+        # integer-valued inputs collapse onto whole numbers
+        if feature != 'price':
+            values = np.unique(np.round(values))
+        return values
+
+    def curve(self, model, profile, feature, values):
+        # one row per grid value, all scored in a single predict call
+        rows = pd.DataFrame([profile] * len(values))
+        rows[PROFILE_COLUMNS[feature]] = values
+        X = self.processor.transform(rows)[self.feature_columns]
+        return model.predict(X)
+
+    def partial_dependence(self, model, df, features=None):
+        # dataset-wide average response, evaluated on a fixed row sample
+        features = features or list(PROFILE_COLUMNS)
+        sample_size = min(len(df), SENSITIVITY_CONFIG['pd_sample_rows'])
+        sample = df[list(PROFILE_COLUMNS.values()) + ['ProductCategory', 'ProductBrand']].sample(
+            n=sample_size, random_state=SENSITIVITY_CONFIG['random_state']
+        )
+
+        curves = {}
+        for feature in features:
+            values = self.feature_grid(feature, df, points=SENSITIVITY_CONFIG['pd_points'])
+            grid = sample.loc[sample.index.repeat(len(values))].reset_index(drop=True)
+            grid[PROFILE_COLUMNS[feature]] = np.tile(values, sample_size)
+
+            predictions = model.predict(self.processor.transform(grid)[self.feature_columns])
+            curves[feature] = {
+                'values': np.round(values, 4).tolist(),
+                'mean_prediction': np.round(predictions.reshape(sample_size, len(values)).mean(axis=0), 4).tolist()
+            }
+        return curves
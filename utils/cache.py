@@ -0,0 +1,43 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+
+    _missing = object()
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, self._missing)
+            if value is self._missing:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        # returns (value, hit); compute runs outside the lock
+        value = self.get(key, self._missing)
+        if value is not self._missing:
+            return value, True
+        value = compute()
+        self.put(key, value)
+        return value, False
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
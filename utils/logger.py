@@ -1,45 +1,137 @@
+import atexit
+import itertools
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+from config import LOGGING_CONFIG
+
+# attributes every LogRecord has; anything else came in through `extra`
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DebugSamplingFilter(logging.Filter):
+    # keeps 1 in every N debug records; other levels always pass
+
+    def __init__(self, rate):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counter = itertools.count()
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+        if not self.every:
+            return False
+        return next(self._counter) % self.every == 0
 
 
 class EchoLogger:
-    
-    def __init__(self, name="EchoMetrics", level=logging.INFO):
+
+    _listeners = {}
+
+    def __init__(self, name="EchoMetrics", level=None, async_mode=None):
         self.logger = logging.getLogger(name)
+        # an explicit level is honoured as given and also caps the file handler
+        self.file_level = logging.DEBUG if level is None else level
+        if level is None:
+            level = logging.getLevelName(LOGGING_CONFIG['level'])
+            # sampled debug records must get past the logger; the console handler stays at INFO
+            if LOGGING_CONFIG['debug_sample_rate'] > 0:
+                level = min(level, logging.DEBUG)
         self.logger.setLevel(level)
-        
+        self.async_mode = LOGGING_CONFIG['async'] if async_mode is None else async_mode
+
         # avoid duplicate handlers
         if not self.logger.handlers:
             self._setup_handlers()
-    
+
+    def _build_file_handler(self):
+        log_dir = LOGGING_CONFIG['log_dir']
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        path = os.path.join(log_dir, LOGGING_CONFIG['file_name'])
+
+        if LOGGING_CONFIG['rotation'] == 'time':
+            return logging.handlers.TimedRotatingFileHandler(
+                path,
+                when=LOGGING_CONFIG['rotate_when'],
+                backupCount=LOGGING_CONFIG['backup_count'],
+                delay=True
+            )
+        return logging.handlers.RotatingFileHandler(
+            path,
+            maxBytes=LOGGING_CONFIG['max_bytes'],
+            backupCount=LOGGING_CONFIG['backup_count'],
+            delay=True
+        )
+
     def _setup_handlers(self):
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
-        
-        file_handler = logging.FileHandler(
-            f"echometrics_{datetime.now().strftime('%Y%m%d')}.log"
-        )
-        file_handler.setLevel(logging.DEBUG)
-        
+
+        file_handler = self._build_file_handler()
+        file_handler.setLevel(self.file_level)
+
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
-        
+
         console_handler.setFormatter(formatter)
-        file_handler.setFormatter(formatter)
-        
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
-    
-    def info(self, message):
-        self.logger.info(message)
-    
-    def error(self, message):
-        self.logger.error(message)
-    
-    def warning(self, message):
-        self.logger.warning(message)
-    
-    def debug(self, message):
-        self.logger.debug(message)
+        file_handler.setFormatter(JsonFormatter() if LOGGING_CONFIG['json'] else formatter)
+
+        sampling_filter = DebugSamplingFilter(LOGGING_CONFIG['debug_sample_rate'])
+
+        if not self.async_mode:
+            file_handler.addFilter(sampling_filter)
+            self.logger.addHandler(console_handler)
+            self.logger.addHandler(file_handler)
+            return
+
+        # callers only enqueue; a background thread does the formatting and I/O
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(sampling_filter)
+
+        listener = logging.handlers.QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(listener.stop)
+        EchoLogger._listeners[self.logger.name] = listener
+
+        self.logger.addHandler(queue_handler)
+
+    def info(self, message, **fields):
+        self.logger.info(message, extra=fields)
+
+    def error(self, message, **fields):
+        self.logger.error(message, extra=fields)
+
+    def warning(self, message, **fields):
+        self.logger.warning(message, extra=fields)
+
+    def debug(self, message, **fields):
+        self.logger.debug(message, extra=fields)
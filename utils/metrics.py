@@ -0,0 +1,176 @@
+import bisect
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+from config import METRICS_CONFIG
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(
+        f'{n}="' + str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for n, v in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f'{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}')
+        return lines
+
+
+class Gauge:
+
+    def __init__(self, name, help_text, fn):
+        self.name = name
+        self.help_text = help_text
+        self.fn = fn  # evaluated at scrape time only
+
+    def render(self):
+        return [
+            f'# HELP {self.name} {self.help_text}',
+            f'# TYPE {self.name} gauge',
+            f'{self.name} {_format_value(self.fn())}'
+        ]
+
+
+class Histogram:
+
+    def __init__(self, name, help_text, label_names=(), buckets=None):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets or METRICS_CONFIG['latency_buckets']))
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        # non-cumulative bucket index; cumulated only when scraped
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = [0] * (len(self.buckets) + 3)
+                self._series[labels] = series
+            series[idx] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+
+        names = self.label_names + ('le',)
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-2]):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}')
+            label_str = _format_labels(self.label_names, labels)
+            lines.append(f'{self.name}_sum{label_str} {series[-2]!r}')
+            lines.append(f'{self.name}_count{label_str} {series[-1]}')
+        return lines
+
+
+def process_rss_bytes():
+    # current RSS from /proc on linux, peak RSS elsewhere
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == 'darwin' else rss * 1024
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+        self.requests = self.counter(
+            'echometrics_http_requests_total', 'HTTP requests handled', ('route', 'method', 'status')
+        )
+        self.errors = self.counter(
+            'echometrics_http_errors_total', 'HTTP requests answered with a 4xx/5xx status', ('route', 'method')
+        )
+        self.latency = self.histogram(
+            'echometrics_http_request_duration_seconds', 'HTTP request latency', ('route', 'method')
+        )
+        self.stage_latency = self.histogram(
+            'echometrics_stage_duration_seconds', 'Time spent in internal stages', ('stage',)
+        )
+        self.chart_render = self.histogram(
+            'echometrics_chart_render_seconds', 'Server-side chart render time', ('chart_type',)
+        )
+        self.cache = self.counter(
+            'echometrics_cache_requests_total', 'In-process cache lookups', ('cache', 'result')
+        )
+        self.register(Gauge(
+            'echometrics_process_resident_memory_bytes', 'Resident set size of the process', process_rss_bytes
+        ))
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, label_names=()):
+        return self.register(Counter(name, help_text, label_names))
+
+    def histogram(self, name, help_text, label_names=(), buckets=None):
+        return self.register(Histogram(name, help_text, label_names, buckets))
+
+    def record_cache(self, cache_name, hit):
+        self.cache.inc(cache_name, 'hit' if hit else 'miss')
+
+    def render(self):
+        lines = []
+        for metric in list(self._metrics):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# shared registry for the web app
+metrics = MetricsRegistry()
@@ -0,0 +1,108 @@
+import cProfile
+import functools
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+from config import PROFILING_CONFIG
+
+
+def _env_flag(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class EchoProfiler:
+    # opt-in cProfile + tracemalloc capture; when disabled nothing is wrapped or registered
+
+    def __init__(self, enabled=None, sample_rate=None, output_dir=None):
+        if enabled is None:
+            enabled = _env_flag('ECHOMETRICS_PROFILE', PROFILING_CONFIG['enabled'])
+        if sample_rate is None:
+            sample_rate = float(os.environ.get('ECHOMETRICS_PROFILE_SAMPLE_RATE', PROFILING_CONFIG['sample_rate']))
+        if output_dir is None:
+            output_dir = os.environ.get('ECHOMETRICS_PROFILE_DIR', PROFILING_CONFIG['output_dir'])
+
+        self.enabled = enabled
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.output_dir = Path(output_dir)
+        self._counter = itertools.count()
+        # cProfile and tracemalloc are process-wide, so only one capture runs at a time
+        self._busy = threading.Lock()
+
+    def _start(self):
+        if not self._busy.acquire(blocking=False):
+            return None
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(PROFILING_CONFIG['tracemalloc_frames'])
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile, started_tracing, time.perf_counter()
+
+    def _stop(self, name, state):
+        profile, started_tracing, start = state
+        try:
+            profile.disable()
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            stem = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{next(self._counter)}"
+            profile.dump_stats(self.output_dir / f"{stem}.prof")
+            snapshot.dump(str(self.output_dir / f"{stem}.tracemalloc"))
+            print(f"Profile for '{name}' ({time.perf_counter() - start:.3f}s) saved to '{self.output_dir / stem}.*'")
+        finally:
+            self._busy.release()
+
+    def wrap(self, name, fn):
+        if not self.enabled:
+            return fn
+
+        @functools.wraps(fn)
+        def profiled(*args, **kwargs):
+            state = self._start()
+            if state is None:
+                return fn(*args, **kwargs)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._stop(name, state)
+
+        return profiled
+
+    def instrument(self, obj, method_names):
+        # swap bound methods on the instance for profiled ones
+        if not self.enabled:
+            return
+        for method_name in method_names:
+            setattr(obj, method_name, self.wrap(method_name.strip('_'), getattr(obj, method_name)))
+
+    def init_app(self, app):
+        if not self.enabled:
+            return
+
+        from flask import g, request
+
+        @app.before_request
+        def _start_request_profile():
+            if random.random() < self.sample_rate:
+                g.profile_state = self._start()
+
+        @app.teardown_request
+        def _stop_request_profile(exc=None):
+            state = g.pop('profile_state', None)
+            if state is not None:
+                endpoint = request.endpoint or 'unmatched'
+                self._stop(f"request_{endpoint}", state)
@@ -0,0 +1,146 @@
+import gzip
+import io
+import zlib
+import numpy as np
+import sys
+import os
+from flask import Response, jsonify
+from flask.json.provider import DefaultJSONProvider
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+from config import SERIALIZATION_CONFIG
+
+# optional fast paths; the app falls back to stdlib json and refuses arrow without them
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+ARROW_MIMETYPE = 'application/vnd.apache.arrow.stream'
+COLUMNAR_MIMETYPE = 'application/vnd.echometrics.columnar+json'
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    # orjson-backed jsonify; numpy arrays and scalars serialize natively
+
+    def _orjson_options(self, indent=False):
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def _default(self, o):
+        if isinstance(o, np.ndarray):
+            return o.tolist()  # object arrays, e.g. strings
+        if isinstance(o, np.generic):
+            return o.item()
+        return self.default(o)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            kwargs.setdefault('default', self._default)
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self._default, option=self._orjson_options(kwargs.get('indent'))).decode()
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self._default, option=self._orjson_options(indent))
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+def negotiate_format(request):
+    # ?format= wins over the Accept header; plain json keeps the row-oriented records layout
+    requested = request.args.get('format')
+    if requested in ('arrow', 'columnar', 'records'):
+        return requested
+
+    best = request.accept_mimetypes.best_match(
+        ['application/json', COLUMNAR_MIMETYPE, ARROW_MIMETYPE], default='application/json'
+    )
+    if best == ARROW_MIMETYPE:
+        return 'arrow'
+    if best == COLUMNAR_MIMETYPE:
+        return 'columnar'
+    return 'records'
+
+
+def columnar(df):
+    # one array per column instead of one object per row
+    return {
+        'columns': [str(column) for column in df.columns],
+        'data': {str(column): df[column].to_numpy() for column in df.columns},
+        'length': len(df)
+    }
+
+
+def _nulls_to_none(df):
+    # stdlib json writes NaN as a bare token, which is not valid JSON; only gappy columns pay for the copy
+    missing = df.columns[df.isna().any()]
+    if len(missing) == 0:
+        return df
+    df = df.copy()
+    df[missing] = df[missing].astype(object).where(df[missing].notna(), None)
+    return df
+
+
+def frame_response(df, key, response_format):
+    if response_format == 'arrow':
+        if pa is None:
+            return jsonify({
+                'error': 'Arrow output requires pyarrow to be installed',
+                'status': 'error'
+            }), 406
+
+        sink = io.BytesIO()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(sink.getvalue(), mimetype=ARROW_MIMETYPE)
+
+    df = _nulls_to_none(df)
+    payload = columnar(df) if response_format == 'columnar' else df.to_dict('records')
+    return jsonify({key: payload, 'status': 'success'})
+
+
+def compress_response(request, response):
+    # gzip/deflate large bodies when the client accepts them
+    if (
+        response.direct_passthrough
+        or response.status_code < 200 or response.status_code in (204, 304)
+        or 'Content-Encoding' in response.headers
+        or response.mimetype not in SERIALIZATION_CONFIG['compressible_mimetypes']
+    ):
+        return response
+
+    body = response.get_data()
+    if len(body) < SERIALIZATION_CONFIG['min_compress_bytes']:
+        return response
+
+    accepted = request.accept_encodings
+    level = SERIALIZATION_CONFIG['compression_level']
+    if accepted['gzip']:
+        response.set_data(gzip.compress(body, compresslevel=level, mtime=0))
+        response.headers['Content-Encoding'] = 'gzip'
+    elif accepted['deflate']:
+        response.set_data(zlib.compress(body, level))
+        response.headers['Content-Encoding'] = 'deflate'
+    else:
+        return response
+
+    # the encoded body differs byte-for-byte from the identity one, so a strong validator no longer holds
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+    response.vary.add('Accept-Encoding')
+    return response
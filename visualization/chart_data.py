@@ -0,0 +1,89 @@
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+from config import CHART_DATA_CONFIG
+
+# chart type -> (kind, x column, y column, colour column, axis labels)
+CHART_SPECS = {
+    'price_vs_sales': (
+        'histogram_2d', 'ProductPrice', 'sales_potential', 'CustomerSatisfaction',
+        {'x': 'Product Price ($)', 'y': 'Sales Potential ($)', 'color': 'Customer Satisfaction',
+         'title': 'Price vs Sales Potential'}
+    ),
+    'category_distribution': (
+        'category_means', 'ProductCategory', 'sales_potential', None,
+        {'x': 'Product Category', 'y': 'Average Sales Potential ($)', 'title': 'Sales Potential by Category'}
+    ),
+    'age_behavior': (
+        'histogram_2d', 'CustomerAge', 'behavior_score', 'PurchaseIntent',
+        {'x': 'Customer Age', 'y': 'Behavior Score', 'color': 'Purchase Intent',
+         'title': 'Age vs Purchase Behavior'}
+    ),
+}
+
+
+def _rounded(values):
+    # nan (empty bins) becomes null in json
+    values = np.round(np.asarray(values, dtype=float), CHART_DATA_CONFIG['decimals'])
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+class ChartDataBuilder:
+    # pre-binned chart aggregates, cached per data version
+
+    def __init__(self, bins=None):
+        self.bins = bins or CHART_DATA_CONFIG['bins']
+        self._cache = {}
+        self._version = None
+
+    def get(self, chart_type, df, data_version):
+        # returns (payload, cache_hit)
+        if chart_type not in CHART_SPECS:
+            raise ValueError(f"Unknown chart type: {chart_type}")
+
+        if data_version != self._version:
+            self._cache = {}
+            self._version = data_version
+
+        payload = self._cache.get(chart_type)
+        if payload is not None:
+            return payload, True
+
+        payload = self.build(chart_type, df)
+        self._cache[chart_type] = payload
+        return payload, False
+
+    def build(self, chart_type, df):
+        kind, x, y, color, labels = CHART_SPECS[chart_type]
+        if kind == 'histogram_2d':
+            data = self._histogram_2d(df[x].to_numpy(float), df[y].to_numpy(float), df[color].to_numpy(float))
+        else:
+            data = self._category_means(df, x, y)
+        return {'chart_type': chart_type, 'kind': kind, 'labels': labels, **data}
+
+    def _histogram_2d(self, x, y, c):
+        counts, x_edges, y_edges = np.histogram2d(x, y, bins=self.bins)
+        color_sums, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges], weights=c)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            color_means = color_sums / counts
+
+        # counts[i][j] is the bin at x_edges[i], y_edges[j]
+        return {
+            'x_edges': _rounded(x_edges),
+            'y_edges': _rounded(y_edges),
+            'counts': counts.astype(int).tolist(),
+            'color_means': _rounded(color_means),
+            'color_range': _rounded([np.min(c), np.max(c)]) if len(c) else [0, 0],
+            'total': int(len(x))
+        }
+
+    def _category_means(self, df, x, y):
+        grouped = df.groupby(x, observed=True)[y].agg(['mean', 'count'])
+        return {
+            'categories': [str(v) for v in grouped.index],
+            'means': _rounded(grouped['mean'].to_numpy()),
+            'counts': grouped['count'].astype(int).tolist(),
+            'total': int(len(df))
+        }
@@ -1,19 +1,56 @@
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
+import numpy as np
+import multiprocessing
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 from config import VIZ_CONFIG
 
+# panel name -> (plot method, dataframe columns shipped to the worker)
+PANELS = {
+    'category_boxplot': ('_plot_category_boxplot', ['ProductCategory', 'sales_potential']),
+    'price_vs_sales': ('_plot_price_vs_sales', ['ProductPrice', 'sales_potential', 'CustomerSatisfaction']),
+    'model_performance': ('_plot_model_performance', None),
+    'customer_behavior': ('_plot_customer_behavior', ['CustomerAge', 'behavior_score', 'PurchaseIntent']),
+    'top_predictions': ('_plot_top_predictions', None),
+    'sales_distribution': ('_plot_sales_distribution', ['sales_potential']),
+}
+
+
+def _init_render_worker():
+    plt.switch_backend('Agg')
+
+
+def _render_panel(method_name, data, path):
+    visualizer = SalesVisualizer(headless=True)
+    fig, ax = plt.subplots(figsize=VIZ_CONFIG['panel_size'])
+    getattr(visualizer, method_name)(data, ax)
+    fig.tight_layout()
+    fig.savefig(path, bbox_inches='tight')
+    plt.close(fig)
+    return str(path)
+
 
 class SalesVisualizer:
-    def __init__(self):
+    def __init__(self, headless=False, output_dir=None, output_format=None):
+        self.headless = headless
+        self.output_dir = Path(output_dir or VIZ_CONFIG['output_dir'])
+        self.output_format = output_format or VIZ_CONFIG['output_format']
+
+        if headless:
+            plt.switch_backend('Agg')
         plt.style.use('default')
         sns.set_palette(VIZ_CONFIG['color_palette'])
     
     def plot_sales_analysis(self, df, scenario_predictions, model_results=None):
         print("\n=== Creating Visualizations ===")
+
+        if self.headless:
+            return self.render_panels(df, scenario_predictions, model_results)
         
         fig, axes = plt.subplots(2, 3, figsize=VIZ_CONFIG['figure_size'])
         fig.suptitle('EchoMetrics Sales Prediction Analysis', fontsize=16, fontweight='bold')
@@ -30,6 +67,50 @@ class SalesVisualizer:
         
         plt.tight_layout()
         plt.show()
+
+    def render_panels(self, df, scenario_predictions, model_results=None):
+        # each panel becomes its own file, rendered in a separate process
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        jobs = []
+        for panel, (method_name, columns) in PANELS.items():
+            if panel == 'model_performance':
+                if not model_results:
+                    continue
+                # ship only what the panel needs, not the fitted models
+                data = {
+                    name: {k: result[k] for k in ('R2', 'y_test', 'predictions')}
+                    for name, result in model_results.items()
+                }
+            elif panel == 'top_predictions':
+                data = scenario_predictions
+            else:
+                data = df[columns]
+            jobs.append((method_name, data, self.output_dir / f"{panel}.{self.output_format}"))
+
+        workers = VIZ_CONFIG['render_workers'] or min(len(jobs), os.cpu_count() or 1)
+        # spawn avoids forking a process that already runs logging/GUI threads
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_render_worker
+        ) as executor:
+            futures = [executor.submit(_render_panel, *job) for job in jobs]
+            paths = [future.result() for future in futures]
+
+        print(f"Saved {len(paths)} panels to '{self.output_dir}'")
+        return paths
+
+    def _scatter_or_density(self, ax, x, y, c, cmap, alpha=None):
+        # hexbin keeps render time bounded by grid size instead of row count
+        if len(x) > VIZ_CONFIG['density_threshold']:
+            return ax.hexbin(
+                x, y,
+                C=c, reduce_C_function=np.mean,
+                gridsize=VIZ_CONFIG['hexbin_gridsize'],
+                cmap=cmap, mincnt=1
+            )
+        return ax.scatter(x, y, alpha=alpha or VIZ_CONFIG['alpha'], c=c, cmap=cmap)
     
     def _plot_category_boxplot(self, df, ax): # FE
         df.boxplot(column='sales_potential', by='ProductCategory', ax=ax)
@@ -40,10 +121,10 @@ class SalesVisualizer:
         plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
     
     def _plot_price_vs_sales(self, df, ax): # FE
-        scatter = ax.scatter(
+        scatter = self._scatter_or_density(
+            ax,
             df['ProductPrice'], 
             df['sales_potential'], 
-            alpha=VIZ_CONFIG['alpha'], 
             c=df['CustomerSatisfaction'], 
             cmap=VIZ_CONFIG['color_palette']
         )
@@ -58,7 +139,10 @@ class SalesVisualizer:
         y_test = best_result['y_test']
         y_pred = best_result['predictions']
         
-        ax.scatter(y_test, y_pred, alpha=VIZ_CONFIG['alpha'])
+        if len(y_test) > VIZ_CONFIG['density_threshold']:
+            ax.hexbin(y_test, y_pred, gridsize=VIZ_CONFIG['hexbin_gridsize'], bins='log', mincnt=1)
+        else:
+            ax.scatter(y_test, y_pred, alpha=VIZ_CONFIG['alpha'])
         ax.plot([y_test.min(), y_test.max()], [y_test.min(), y_test.max()], 'r--', lw=2)
         ax.set_xlabel('Actual Sales Potential ($)')
         ax.set_ylabel('Predicted Sales Potential ($)')
@@ -66,10 +150,10 @@ class SalesVisualizer:
         ax.grid(True, alpha=VIZ_CONFIG['grid_alpha'])
     
     def _plot_customer_behavior(self, df, ax): # FE
-        scatter = ax.scatter(
+        scatter = self._scatter_or_density(
+            ax,
             df['CustomerAge'], 
             df['behavior_score'], 
-            alpha=VIZ_CONFIG['alpha'], 
             c=df['PurchaseIntent'], 
             cmap='coolwarm'
         )
@@ -125,4 +209,13 @@ class SalesVisualizer:
         plt.title('Feature Importance Analysis')
         plt.grid(True, alpha=VIZ_CONFIG['grid_alpha'], axis='x')
         plt.tight_layout()
+
+        if self.headless:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path = self.output_dir / f"feature_importance.{self.output_format}"
+            plt.savefig(path, bbox_inches='tight')
+            plt.close()
+            print(f"Feature importance plot saved to '{path}'")
+            return str(path)
+
         plt.show()
@@ -2,10 +2,12 @@ class EchoMetricsDashboard {
     constructor() {
         // map backend chart types to DOM element IDs
         this.chartDomMap = {
-            'price_vs_sales': { img: 'price-chart-img', spinner: 'price-spinner' },
-            'category_distribution': { img: 'category-chart-img', spinner: 'category-spinner' },
-            'age_behavior': { img: 'behavior-chart-img', spinner: 'behavior-spinner' }
+            'price_vs_sales': { img: 'price-chart-img', canvas: 'price-chart-canvas', spinner: 'price-spinner' },
+            'category_distribution': { img: 'category-chart-img', canvas: 'category-chart-canvas', spinner: 'category-spinner' },
+            'age_behavior': { img: 'behavior-chart-img', canvas: 'behavior-chart-canvas', spinner: 'behavior-spinner' }
         };
+        // colour stops for the density heatmap (approximate viridis)
+        this.colorStops = [[68, 1, 84], [59, 82, 139], [33, 145, 140], [94, 201, 98], [253, 231, 37]];
         this.initializeEventListeners();
         this.loadAnalytics();
         this.loadScenarios();
@@ -154,14 +156,19 @@ class EchoMetricsDashboard {
     async loadChart(chartType) {
         const dom = this.chartDomMap[chartType] || {};
         const imgElement = document.getElementById(dom.img);
+        const canvas = document.getElementById(dom.canvas);
         const spinner = document.getElementById(dom.spinner);
 
         if (!imgElement || !spinner) return;
 
         spinner.style.display = 'block';
         imgElement.style.display = 'none';
+        if (canvas) canvas.style.display = 'none';
 
         try {
+            // prefer pre-binned data drawn in the browser; fall back to a server-rendered image
+            if (canvas && await this.loadChartData(chartType, canvas)) return;
+
             const response = await fetch(`/api/chart/${chartType}`);
             const result = await response.json();
 
@@ -176,6 +183,138 @@ class EchoMetricsDashboard {
         }
     }
 
+    async loadChartData(chartType, canvas) {
+        try {
+            const response = await fetch(`/api/chart-data/${chartType}`);
+            const result = await response.json();
+            if (result.status !== 'success') return false;
+
+            const data = result.chart_data;
+            if (data.kind === 'histogram_2d') this.drawHistogram2d(canvas, data);
+            else if (data.kind === 'category_means') this.drawCategoryBars(canvas, data);
+            else return false;
+
+            canvas.style.display = 'block';
+            return true;
+        } catch (error) {
+            console.error('Failed to load chart data:', error);
+            return false;
+        }
+    }
+
+    colorAt(t) {
+        const stops = this.colorStops;
+        const pos = Math.min(Math.max(t, 0), 1) * (stops.length - 1);
+        const i = Math.min(Math.floor(pos), stops.length - 2);
+        const f = pos - i;
+        const rgb = stops[i].map((c, k) => Math.round(c + (stops[i + 1][k] - c) * f));
+        return `rgb(${rgb[0]}, ${rgb[1]}, ${rgb[2]})`;
+    }
+
+    prepareCanvas(canvas, labels) {
+        const ctx = canvas.getContext('2d');
+        const plot = { left: 80, top: 50, right: canvas.width - 110, bottom: canvas.height - 70 };
+
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+        ctx.fillStyle = '#fff';
+        ctx.fillRect(0, 0, canvas.width, canvas.height);
+
+        ctx.fillStyle = '#222';
+        ctx.font = 'bold 16px sans-serif';
+        ctx.textAlign = 'center';
+        ctx.fillText(labels.title || '', canvas.width / 2, 28);
+        ctx.font = '13px sans-serif';
+        ctx.fillText(labels.x || '', (plot.left + plot.right) / 2, canvas.height - 20);
+
+        ctx.save();
+        ctx.translate(20, (plot.top + plot.bottom) / 2);
+        ctx.rotate(-Math.PI / 2);
+        ctx.fillText(labels.y || '', 0, 0);
+        ctx.restore();
+
+        ctx.strokeStyle = '#444';
+        ctx.strokeRect(plot.left, plot.top, plot.right - plot.left, plot.bottom - plot.top);
+        return { ctx, plot };
+    }
+
+    drawTicks(ctx, plot, xMin, xMax, yMin, yMax) {
+        ctx.fillStyle = '#444';
+        ctx.font = '11px sans-serif';
+        for (let i = 0; i <= 5; i++) {
+            const t = i / 5;
+            ctx.textAlign = 'center';
+            ctx.fillText((xMin + (xMax - xMin) * t).toFixed(1), plot.left + (plot.right - plot.left) * t, plot.bottom + 16);
+            ctx.textAlign = 'right';
+            ctx.fillText((yMin + (yMax - yMin) * t).toFixed(1), plot.left - 6, plot.bottom - (plot.bottom - plot.top) * t + 4);
+        }
+    }
+
+    drawHistogram2d(canvas, data) {
+        const { ctx, plot } = this.prepareCanvas(canvas, data.labels);
+        const xEdges = data.x_edges;
+        const yEdges = data.y_edges;
+        const [cMin, cMax] = data.color_range;
+        const xMin = xEdges[0], xMax = xEdges[xEdges.length - 1];
+        const yMin = yEdges[0], yMax = yEdges[yEdges.length - 1];
+        const sx = (plot.right - plot.left) / ((xMax - xMin) || 1);
+        const sy = (plot.bottom - plot.top) / ((yMax - yMin) || 1);
+        const maxCount = Math.max(1, ...data.counts.flat());
+
+        // cell colour is the mean colour value of the bin, opacity scales with its count
+        data.counts.forEach((row, i) => {
+            row.forEach((count, j) => {
+                if (!count) return;
+                const mean = data.color_means[i][j];
+                ctx.globalAlpha = 0.35 + 0.65 * Math.sqrt(count / maxCount);
+                ctx.fillStyle = this.colorAt((mean - cMin) / ((cMax - cMin) || 1));
+                const x = plot.left + (xEdges[i] - xMin) * sx;
+                const y = plot.bottom - (yEdges[j + 1] - yMin) * sy;
+                ctx.fillRect(x, y, (xEdges[i + 1] - xEdges[i]) * sx + 0.5, (yEdges[j + 1] - yEdges[j]) * sy + 0.5);
+            });
+        });
+        ctx.globalAlpha = 1;
+
+        this.drawTicks(ctx, plot, xMin, xMax, yMin, yMax);
+
+        // colour bar
+        const barX = plot.right + 25;
+        for (let k = 0; k <= 100; k++) {
+            ctx.fillStyle = this.colorAt(k / 100);
+            ctx.fillRect(barX, plot.bottom - (plot.bottom - plot.top) * k / 100 - 3, 16, 4);
+        }
+        ctx.fillStyle = '#444';
+        ctx.textAlign = 'left';
+        ctx.fillText(cMax.toFixed(1), barX + 20, plot.top + 4);
+        ctx.fillText(cMin.toFixed(1), barX + 20, plot.bottom);
+        ctx.save();
+        ctx.translate(barX + 70, (plot.top + plot.bottom) / 2);
+        ctx.rotate(-Math.PI / 2);
+        ctx.textAlign = 'center';
+        ctx.fillText(data.labels.color || '', 0, 0);
+        ctx.restore();
+    }
+
+    drawCategoryBars(canvas, data) {
+        const { ctx, plot } = this.prepareCanvas(canvas, data.labels);
+        const maxMean = Math.max(1, ...data.means.map(v => v || 0));
+        const slot = (plot.right - plot.left) / Math.max(1, data.categories.length);
+
+        data.categories.forEach((category, i) => {
+            const value = data.means[i] || 0;
+            const height = (plot.bottom - plot.top) * value / maxMean;
+            const x = plot.left + slot * i + slot * 0.15;
+
+            ctx.fillStyle = this.colorAt(0.3);
+            ctx.fillRect(x, plot.bottom - height, slot * 0.7, height);
+
+            ctx.fillStyle = '#444';
+            ctx.textAlign = 'center';
+            ctx.font = '11px sans-serif';
+            ctx.fillText(category, x + slot * 0.35, plot.bottom + 16);
+            ctx.fillText(`$${value.toFixed(0)}`, x + slot * 0.35, plot.bottom - height - 6);
+        });
+    }
+
     showError(message) {
         const alertDiv = document.createElement('div');
         alertDiv.className = 'alert alert-danger alert-dismissible fade show mt-3';